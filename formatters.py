@@ -1,536 +1,1154 @@
 # formatters.py
 
+import os
+import csv
 import json
 import base64
+import binascii
+import time
+from array import array
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterator, NamedTuple, Optional, TextIO, Union
+
+_END = object()
+
+
+class FormatterSpec(NamedTuple):
+    """Declarative description of how an endpoint's payload is rendered.
+
+    kind is one of:
+        'detail'  -- a single dict shown as fixed "Label : value" lines, labels padded to width
+        'records' -- a list of dicts shown one numbered line per row, restricted to fields
+        'stats'   -- an arbitrary (possibly nested) dict, labels derived from its keys
+        'blob'    -- a base64 string, only its length and a snippet are shown
+    """
+    kind: str
+    title: str
+    empty: Optional[str]      # returned as-is for empty data; None renders an empty records block
+    fields: tuple = ()        # 'detail': (label, key) pairs; 'records': keys
+    width: int = 0            # 'detail': label column width
+
+
+@lru_cache(maxsize=None)
+def _label(field: str) -> str:
+    """Turns an API key such as 'jumlah_dosen' into a display label ('Jumlah Dosen')."""
+    return field.replace('_', ' ').title()
+
+
+def _template_text(text: str) -> str:
+    """Escapes text so it can be embedded literally in a str.format template."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class CompiledFormatter:
+    """A compiled spec: call it for the whole string, or use lines() to stream it.
+
+    lines(data, start, stop) yields the output piece by piece (a multi-line row is one piece);
+    joining the pieces with "\n" gives exactly what calling the formatter returns.
+    For list layouts start/stop select a slice of the rows, numbered as in the full output.
+    """
+    __slots__ = ('render', 'lines', 'paginated')
+
+    def __init__(self, render: Callable, lines: Optional[Callable] = None):
+        self.render = render
+        self.paginated = lines is not None
+        self.lines = lines or self._whole_lines
+
+    def __call__(self, data) -> str:
+        return self.render(data)
+
+    def _whole_lines(self, data, start=0, stop=None):
+        yield self.render(data)
+
+
+def _compile_detail(spec: FormatterSpec) -> CompiledFormatter:
+    lines = [_template_text(f"--- {spec.title} ---")]
+    lines += [f"{_template_text(label.ljust(spec.width))}: {{}}" for label, _ in spec.fields]
+    lines.append("-" * (len(spec.title) + 8))
+    template = "\n".join(lines)
+    keys = [key for _, key in spec.fields]
+
+    def render(data):
+        if not data:
+            return spec.empty
+        return template.format(*[data.get(key, 'N/A') for key in keys])
+    return CompiledFormatter(render)
+
+
+def _row_function(prefix: str, labels: list, keys: list, sep: str) -> Callable:
+    """Returns row(i, item) -> f"{i}{prefix}{labels[0]}{value0}{sep}{labels[1]}{value1}...".
+
+    Labels and separators are baked into one %-template up front (%s renders the JSON
+    scalars of the payloads exactly like an f-string); the values are fetched with a single
+    itemgetter, falling back to item.get(key, 'N/A') for rows that lack a key.
+    """
+    keys = tuple(keys)
+    template = "%s" + prefix.replace('%', '%%') + sep.replace('%', '%%').join(
+        label.replace('%', '%%') + "%s" for label in labels)
+    if not keys:
+        return lambda i, item: template % (i,)
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda i, item: template % (i, item.get(key, 'N/A'))
+    getter = itemgetter(*keys)
+
+    def row(i, item):
+        try:
+            return template % ((i,) + getter(item))
+        except KeyError:
+            return template % (i, *[item.get(key, 'N/A') for key in keys])
+    return row
+
+
+def _list_formatter(header: str, footer: str, row: Callable, empty: tuple) -> CompiledFormatter:
+    """Builds the formatter for a numbered list of rows.
+
+    Args:
+        header (str): First line of the block.
+        footer (str): Last line of the block.
+        row (Callable): row(number, item) as returned by _row_function.
+        empty (tuple): Lines shown instead when there are no rows at all.
+    """
+    def render(data):
+        if not data:
+            return "\n".join(empty)
+        output = [header]
+        output += [row(i, item) for i, item in enumerate(data, 1)]
+        output.append(footer)
+        return "\n".join(output)
+
+    def lines(data, start=0, stop=None):
+        rows = islice(data or (), start, stop)
+        first = next(rows, _END)
+        if first is _END:
+            # A page past the end still gets its titled block
+            yield from (empty if start == 0 else (header, "Tidak ada data ditemukan."))
+            return
+        yield header
+        yield row(start + 1, first)
+        for i, item in enumerate(rows, start + 2):
+            yield row(i, item)
+        yield footer
+
+    return CompiledFormatter(render, lines)
+
+
+def _compile_records(spec: FormatterSpec) -> CompiledFormatter:
+    header = f"--- {spec.title} ---"
+    empty = (spec.empty,) if spec.empty is not None else (header, "Tidak ada data ditemukan.")
+    row = _row_function(". ", [f"{_label(field)}: " for field in spec.fields], spec.fields, ", ")
+    return _list_formatter(header, "-" * (len(spec.title) + 8), row, empty)
+
+
+def _compile_stats(spec: FormatterSpec) -> CompiledFormatter:
+    header = f"--- {spec.title} ---"
+    footer = "-" * (len(spec.title) + 8)
+
+    def render(data):
+        if not data and spec.empty is not None:
+            return spec.empty
+        output = [header]
+        for key, value in data.items():
+            if isinstance(value, dict):
+                output.append(f"{_label(key)}:")
+                output += [f"  {_label(sub_key)}: {sub_value}" for sub_key, sub_value in value.items()]
+            else:
+                output.append(f"{_label(key)}: {value}")
+        output.append(footer)
+        return "\n".join(output)
+    return CompiledFormatter(render)
+
+
+def _compile_blob(spec: FormatterSpec) -> CompiledFormatter:
+    prefix = f"Data {spec.title} (base64) diterima. Panjang: "
+
+    def render(data):
+        if not data:
+            return spec.empty
+        return f"{prefix}{len(data)} karakter. Cuplikan: {data[:100]}..."
+    return CompiledFormatter(render)
+
+
+_COMPILERS = {
+    'detail': _compile_detail,
+    'records': _compile_records,
+    'stats': _compile_stats,
+    'blob': _compile_blob,
+}
+
+
+def compile_formatter(spec: FormatterSpec) -> CompiledFormatter:
+    """Builds the formatter for a spec; labels, padding and row templates are computed here once.
+
+    Args:
+        spec (FormatterSpec): Layout of the endpoint's payload.
+
+    Returns:
+        CompiledFormatter: Callable taking the API payload and returning the formatted string.
+    """
+    try:
+        compiler = _COMPILERS[spec.kind]
+    except KeyError:
+        raise ValueError(f"Unknown formatter kind: {spec.kind}") from None
+    return compiler(spec)
+
+
+def _detail(title, empty, width, fields):
+    return FormatterSpec('detail', title, empty, tuple(fields), width)
+
+
+def _records(title, empty, fields):
+    return FormatterSpec('records', title, empty, tuple(fields))
+
+
+def _stats(title):
+    return FormatterSpec('stats', title, f"{title} tidak ditemukan.")
+
+
+def _blob(title, empty):
+    return FormatterSpec('blob', title, empty)
+
+
+_ACTIVITY_FIELDS = ('judul_kegiatan', 'tahun_kegiatan', 'jenis_kegiatan')
+
+SPECS = {
+    # --- Perguruan Tinggi ---
+    'pt_details': _detail("Detail Perguruan Tinggi", "Detail Perguruan Tinggi tidak ditemukan.", 13, [
+        ("Nama PT", 'nama_pt'),
+        ("Singkatan PT", 'nm_singkat'),
+        ("Kode PT", 'kode_pt'),
+        ("Alamat", 'alamat'),
+        ("Kota/Kab", 'kab_kota_pt'),
+        ("Provinsi", 'provinsi_pt'),
+        ("Website", 'website'),
+        ("Email", 'email'),
+        ("Telepon", 'no_tel'),
+        ("Status", 'status_pt'),
+        ("Akreditasi", 'akreditasi_pt'),
+    ]),
+    'prodi_pt_list': _records("Daftar Program Studi di PT", "Program Studi tidak ditemukan untuk PT ini.",
+                              ['nama_prodi', 'jenjang_prodi', 'akreditasi', 'jumlah_mahasiswa', 'jumlah_dosen']),
+    'logo_pt': _blob("Logo", "Logo tidak ditemukan."),
+    'rasio_pt': _stats("Rasio Mahasiswa & Dosen"),
+    'mahasiswa_pt_stats': _stats("Statistik Mahasiswa"),
+    'waktu_studi_pt': _records("Rata-rata Waktu Studi PT", "Data Waktu Studi tidak ditemukan.",
+                               ['jenjang', 'mean_masa_studi']),
+    'name_histories_pt': _records("Sejarah Nama Perguruan Tinggi", "Sejarah Nama PT tidak ditemukan.",
+                                  ['nama_lama', 'tanggal_perubahan']),  # Assuming these fields based on common patterns
+    'cost_range_pt': _stats("Kisaran Biaya Kuliah PT"),
+    'graduation_rate_pt': _stats("Tingkat Kelulusan PT"),
+    'jumlah_prodi_pt': _stats("Jumlah Program Studi PT"),
+    'jumlah_mahasiswa_pt': _stats("Jumlah Mahasiswa PT"),
+    'jumlah_dosen_pt': _stats("Jumlah Dosen PT"),
+    'sarpras_file_name_pt': _records("Nama File Sarpras PT", "Nama File Sarpras tidak ditemukan.",
+                                     ['id_blob', 'file_name']),
+    'sarpras_blob_pt': _blob("Blob Sarpras", "Blob Sarpras tidak ditemukan."),
+
+    # --- Dosen ---
+    'dosen_profile': _detail("Profil Dosen", "Profil Dosen tidak ditemukan.", 18, [
+        ("Nama Dosen", 'nama_dosen'),
+        ("NIDN", 'nidn'),
+        ("Jenis Kelamin", 'jenis_kelamin'),
+        ("Jabatan Akademik", 'jabatan_akademik'),
+        ("Pendidikan Tertinggi", 'pendidikan_tertinggi'),
+        ("Status Ikatan Kerja", 'status_ikatan_kerja'),
+        ("Status Aktivitas", 'status_aktivitas'),
+        ("Nama PT", 'nama_pt'),
+        ("Nama Prodi", 'nama_prodi'),
+    ]),
+    'dosen_penelitian': _records("Penelitian Dosen", "Penelitian Dosen tidak ditemukan.", _ACTIVITY_FIELDS),
+    'dosen_pengabdian': _records("Pengabdian Dosen", "Pengabdian Dosen tidak ditemukan.", _ACTIVITY_FIELDS),
+    'dosen_karya': _records("Karya Ilmiah Dosen", "Karya Ilmiah Dosen tidak ditemukan.", _ACTIVITY_FIELDS),
+    'dosen_paten': _records("Paten Dosen", "Paten Dosen tidak ditemukan.", _ACTIVITY_FIELDS),
+    'dosen_study_history': _records("Riwayat Studi Dosen", "Riwayat Studi Dosen tidak ditemukan.",
+                                    ['jenjang', 'bidang_studi', 'nama_pt', 'tahun_lulus']),
+    'dosen_teaching_history': _records("Riwayat Mengajar Dosen", "Riwayat Mengajar Dosen tidak ditemukan.",
+                                       ['nama_semester', 'nama_matkul', 'nama_kelas', 'nama_pt']),
+
+    # --- Mahasiswa ---
+    'mahasiswa_details': _detail("Detail Mahasiswa", "Detail Mahasiswa tidak ditemukan.", 13, [
+        ("Nama", 'nama'),
+        ("NIM", 'nim'),
+        ("Jenis Kelamin", 'jenis_kelamin'),
+        ("Tempat Lahir", 'tempat_lahir'),
+        ("Tgl. Lahir", 'tanggal_lahir'),
+        ("Universitas", 'nama_pt'),
+        ("Program Studi", 'prodi'),
+        ("Jenjang", 'jenjang'),
+        ("Tgl. Masuk", 'tanggal_masuk'),
+        ("Status", 'status_saat_ini'),
+        ("Nama Ibu", 'nama_ibu'),
+    ]),
+
+    # --- Program Studi ---
+    'prodi_details': _detail("Detail Program Studi", "Detail Program Studi tidak ditemukan.", 16, [
+        ("Nama Prodi", 'nama_prodi'),
+        ("Jenjang", 'jenj_didik'),
+        ("Kode Prodi", 'kode_prodi'),
+        ("Akreditasi", 'akreditasi'),
+        ("Nama PT", 'nama_pt'),
+        ("Tanggal Berdiri", 'tgl_berdiri'),
+        ("Status", 'status'),
+        ("Email", 'email'),
+        ("Website", 'website'),
+    ]),
+    'prodi_description': _detail("Deskripsi Program Studi", "Deskripsi Program Studi tidak ditemukan.", 19, [
+        ("Deskripsi Singkat", 'deskripsi_singkat'),
+        ("Visi", 'visi'),
+        ("Misi", 'misi'),
+        ("Kompetensi", 'kompetensi'),
+        ("Capaian Belajar", 'capaian_belajar'),
+    ]),
+    'prodi_name_histories': _records("Sejarah Nama Program Studi", "Sejarah Nama Program Studi tidak ditemukan.",
+                                     ['nama_lama', 'tanggal_perubahan']),  # Assuming common fields
+    'prodi_num_students_lecturers': _stats("Jumlah Mahasiswa & Dosen Prodi"),
+    'prodi_cost_range': _stats("Kisaran Biaya Kuliah Prodi"),
+    'prodi_daya_tampung': _stats("Daya Tampung Prodi"),
+    'prodi_rasio_dosen_mahasiswa': _stats("Rasio Dosen Mahasiswa Prodi"),
+    'prodi_graduation_rate': _stats("Tingkat Kelulusan Prodi"),
+    'logo_prodi': _blob("Logo Prodi", "Logo Prodi tidak ditemukan."),
+    'homebase_prodi': _stats("Homebase Prodi"),
+    # Dict or list payload; the text layout for lists is _format_counter_list
+    'penghitung_ratio_prodi': _stats("Penghitung Rasio Prodi"),
+
+    # --- Statistik & Visualisasi ---
+    'dosen_count_active': _stats("Jumlah Dosen Aktif"),
+    'mahasiswa_count_active': _stats("Jumlah Mahasiswa Aktif"),
+    'prodi_count': _stats("Jumlah Program Studi"),
+    'pt_count': _stats("Jumlah Perguruan Tinggi"),
+    'data_dosen_keaktifan': _records("Visualisasi Keaktifan Dosen", "Data Keaktifan Dosen tidak ditemukan.",
+                                     ['status_keaktifan', 'jumlah_dosen']),
+    'data_dosen_bidang': _records("Visualisasi Dosen Berdasarkan Bidang",
+                                  "Data Dosen Berdasarkan Bidang tidak ditemukan.",
+                                  ['bidang', 'jumlah_dosen']),
+    'data_dosen_jenis_kelamin': _records("Visualisasi Dosen Berdasarkan Jenis Kelamin",
+                                         "Data Dosen Berdasarkan Jenis Kelamin tidak ditemukan.",
+                                         ['jenis_kelamin', 'jumlah']),
+    'data_dosen_jenjang': _records("Visualisasi Dosen Berdasarkan Jenjang",
+                                   "Data Dosen Berdasarkan Jenjang tidak ditemukan.",
+                                   ['jenjang_dosen', 'jumlah_dosen']),
+    'data_dosen_ikatan': _records("Visualisasi Dosen Berdasarkan Ikatan",
+                                  "Data Dosen Berdasarkan Ikatan tidak ditemukan.",
+                                  ['ikatan_dosen', 'jumlah']),
+    'data_mahasiswa_bidang': _records("Visualisasi Mahasiswa Berdasarkan Bidang",
+                                      "Data Mahasiswa Berdasarkan Bidang tidak ditemukan.",
+                                      ['bidang', 'jumlah_mhs']),
+    'data_mahasiswa_jenis_kelamin': _records("Visualisasi Mahasiswa Berdasarkan Jenis Kelamin",
+                                             "Data Mahasiswa Berdasarkan Jenis Kelamin tidak ditemukan.",
+                                             ['jenis_kelamin', 'jumlah_mhs']),
+    'data_mahasiswa_jenjang': _records("Visualisasi Mahasiswa Berdasarkan Jenjang",
+                                       "Data Mahasiswa Berdasarkan Jenjang tidak ditemukan.",
+                                       ['nama_jenjang', 'jumlah_mhs']),
+    'data_mahasiswa_kelompok_lembaga': _records("Visualisasi Mahasiswa Berdasarkan Kelompok Lembaga",
+                                                "Data Mahasiswa Berdasarkan Kelompok Lembaga tidak ditemukan.",
+                                                ['kelompok_lembaga', 'jumlah_mhs']),
+    'data_mahasiswa_status': _records("Visualisasi Mahasiswa Berdasarkan Status",
+                                      "Data Mahasiswa Berdasarkan Status tidak ditemukan.",
+                                      ['status_mahasiswa', 'jumlah']),
+    'data_pt_bentuk': _records("Visualisasi Perguruan Tinggi Berdasarkan Bentuk",
+                               "Data Perguruan Tinggi Berdasarkan Bentuk tidak ditemukan.",
+                               ['bentuk_pt', 'jumlah_pt']),
+    'data_pt_akreditasi': _records("Visualisasi Perguruan Tinggi Berdasarkan Akreditasi",
+                                   "Data Perguruan Tinggi Berdasarkan Akreditasi tidak ditemukan.",
+                                   ['akreditasi', 'jumlah_pt']),
+    'data_pt_kelompok_pembina': _records("Visualisasi Perguruan Tinggi Berdasarkan Kelompok Pembina",
+                                         "Data Perguruan Tinggi Berdasarkan Kelompok Pembina tidak ditemukan.",
+                                         ['kelompok_pembina', 'jumlah_pt']),
+    'data_pt_provinsi': _records("Visualisasi Perguruan Tinggi Berdasarkan Provinsi",
+                                 "Data Perguruan Tinggi Berdasarkan Provinsi tidak ditemukan.",
+                                 ['provinsi', 'jumlah_pt']),
+    'data_prodi_jenjang': _records("Visualisasi Program Studi Berdasarkan Jenjang",
+                                   "Data Program Studi Berdasarkan Jenjang tidak ditemukan.",
+                                   ['jenjang_prodi', 'jumlah_prodi']),
+    'data_prodi_akreditasi': _records("Visualisasi Program Studi Berdasarkan Akreditasi",
+                                      "Data Program Studi Berdasarkan Akreditasi tidak ditemukan.",
+                                      ['akreditasi_prodi', 'jumlah_prodi']),
+    'data_prodi_bidang_ilmu': _records("Visualisasi Program Studi Berdasarkan Bidang Ilmu",
+                                       "Data Program Studi Berdasarkan Bidang Ilmu tidak ditemukan.",
+                                       ['bidang_ilmu', 'jumlah_prodi']),
+    'data_prodi_kelompok_pembina': _records("Visualisasi Program Studi Berdasarkan Kelompok Pembina",
+                                            "Data Program Studi Berdasarkan Kelompok Pembina tidak ditemukan.",
+                                            ['kelompok_pembina', 'jumlah_prodi']),
+
+    # --- Search Results (empty lists still render the titled block) ---
+    'search_dosen': _records("Dosen", None, ['nama', 'nidn', 'nama_pt', 'nama_prodi']),
+    'search_mahasiswa': _records("Mahasiswa", None, ['nama', 'nim', 'nama_pt', 'nama_prodi']),
+    'search_pt': _records("Perguruan Tinggi", None, ['nama', 'kode', 'nama_singkat']),
+    'search_prodi': _records("Program Studi", None, ['nama', 'jenjang', 'pt']),
+
+    # --- Data Umum ---
+    'contributor_list': _records("Daftar Kontributor", "Daftar Kontributor tidak ditemukan.",
+                                 ['name', 'role', 'universitas', 'linkedin']),
+    'news_list': _records("Daftar Berita", "Daftar Berita tidak ditemukan.",
+                          ['title', 'date', 'url']),  # Assuming 'url' field based on common news API responses
+    'bidang_ilmu_prodi': _records("Daftar Bidang Ilmu Program Studi", "Daftar Bidang Ilmu Prodi tidak ditemukan.",
+                                  ['nama']),  # Assuming field is 'nama' for the name of the field
+}
+
 
 def _format_dict(data: dict, title: str) -> str:
     """Helper to format a dictionary into a readable string."""
-    output = [f"--- {title} ---"]
-    for key, value in data.items():
-        if isinstance(value, dict):
-            output.append(f"{key.replace('_', ' ').title()}:")
-            for sub_key, sub_value in value.items():
-                output.append(f"  {sub_key.replace('_', ' ').title()}: {sub_value}")
-        else:
-            output.append(f"{key.replace('_', ' ').title()}: {value}")
-    output.append("-" * (len(title) + 8)) # Adjust line length for title
-    return "\n".join(output)
+    return _stats_formatter(title)(data)
 
 def _format_list_of_dicts(data: list, title: str, fields: list) -> str:
     """Helper to format a list of dictionaries into a readable string."""
-    output = [f"--- {title} ---"]
+    return _records_formatter(title, tuple(fields))(data)
+
+# Ad-hoc layouts (dynamic titles/fields) are compiled on first use and memoized
+@lru_cache(maxsize=256)
+def _stats_formatter(title: str) -> CompiledFormatter:
+    return compile_formatter(FormatterSpec('stats', title, None))
+
+@lru_cache(maxsize=256)
+def _records_formatter(title: str, fields: tuple) -> CompiledFormatter:
+    return compile_formatter(_records(title, None, fields))
+
+@lru_cache(maxsize=256)
+def _search_results_formatter(title: str, fields: tuple) -> CompiledFormatter:
+    row = _row_function(". ", [f"\n  {_label(field)}: " for field in fields], fields, "")
+    return _list_formatter(f"--- Hasil Pencarian {title} ---", "-" * (len(title) + 20), row,
+                           (f"Tidak ada {title} yang ditemukan.",))
+
+
+def _format_counter_list(data) -> str:
+    """Renders the ratio counter, which the API returns either as a dict or as a list of rows."""
+    title = "Penghitung Rasio Prodi"
     if not data:
-        output.append("Tidak ada data ditemukan.")
-        return "\n".join(output)
-    
-    for i, item in enumerate(data):
-        item_details = []
-        for field in fields:
-            item_details.append(f"{field.replace('_', ' ').title()}: {item.get(field, 'N/A')}")
-        output.append(f"{i+1}. {', '.join(item_details)}")
+        return f"{title} tidak ditemukan."
+    if not isinstance(data, list):
+        return _format_dict(data, title)
+
+    output = [f"--- {title} ---"]
+    for i, item in enumerate(data, 1):
+        output.append(f"{i}. Data:")
+        if isinstance(item, dict):
+            output += [f"   {_label(key)}: {value}" for key, value in item.items()]
+        else:
+            output.append(f"   {item}")
     output.append("-" * (len(title) + 8))
     return "\n".join(output)
 
+
+# Endpoint name -> compiled formatter
+FORMATTERS = {name: compile_formatter(spec) for name, spec in SPECS.items()}
+FORMATTERS['penghitung_ratio_prodi'] = CompiledFormatter(_format_counter_list)
+
+# --- Streaming & Pagination ---
+def _page_bounds(page: Optional[int], page_size: Optional[int]) -> tuple:
+    """Turns 1-based page/page_size into a (start, stop) row slice."""
+    if page is None and page_size is None:
+        return 0, None
+    if page_size is None or page_size < 1:
+        raise ValueError("page_size must be a positive number of rows")
+    page = 1 if page is None else page
+    if page < 1:
+        raise ValueError("page numbers start at 1")
+    return (page - 1) * page_size, page * page_size
+
+def iter_format(formatter: Union[str, CompiledFormatter], data,
+                page: Optional[int] = None, page_size: Optional[int] = None) -> Iterator[str]:
+    """Streams a formatter's output instead of building the whole string.
+
+    Args:
+        formatter (str | CompiledFormatter): Registry name (e.g. 'search_mahasiswa') or a compiled formatter.
+        data: The API payload; list layouts also accept any iterable of rows.
+        page (int, optional): 1-based page to render; rows keep their global numbering.
+        page_size (int, optional): Rows per page; required for pagination.
+
+    Returns:
+        Iterator[str]: Output pieces; "\n".join() of them equals the non-streaming result.
+    """
+    if isinstance(formatter, str):
+        formatter = FORMATTERS[formatter]
+    start, stop = _page_bounds(page, page_size)
+    if (start, stop) != (0, None) and not formatter.paginated:
+        raise ValueError("Only list formatters can be paginated")
+    return formatter.lines(data, start, stop)
+
+def iter_chunks(formatter: Union[str, CompiledFormatter], data, page: Optional[int] = None,
+                page_size: Optional[int] = None, chunk_lines: int = 1000) -> Iterator[str]:
+    """Like iter_format, but groups up to chunk_lines pieces into one newline-terminated string."""
+    pieces = iter_format(formatter, data, page, page_size)
+    while True:
+        chunk = list(islice(pieces, chunk_lines))
+        if not chunk:
+            return
+        chunk.append("")
+        yield "\n".join(chunk)
+
+def write_format(formatter: Union[str, CompiledFormatter], data, file: TextIO, page: Optional[int] = None,
+                 page_size: Optional[int] = None, chunk_lines: int = 1000) -> int:
+    """Writes a formatter's output to a text file-like object as it is rendered.
+
+    Args:
+        formatter (str | CompiledFormatter): Registry name or compiled formatter.
+        data: The API payload.
+        file (TextIO): Destination, e.g. sys.stdout or an open file.
+        page (int, optional): 1-based page to render.
+        page_size (int, optional): Rows per page.
+        chunk_lines (int): Pieces buffered per write() call.
+
+    Returns:
+        int: Number of characters written (the output ends with a newline).
+    """
+    written = 0
+    for chunk in iter_chunks(formatter, data, page, page_size, chunk_lines):
+        written += file.write(chunk)
+    return written
+
+# --- Blobs (logo / sarpras base64 payloads) ---
+# (magic prefix, offset, MIME type); checked against the first decoded bytes only
+_MAGIC_NUMBERS = [
+    (b'\x89PNG\r\n\x1a\n', 0, 'image/png'),
+    (b'\xff\xd8\xff', 0, 'image/jpeg'),
+    (b'GIF87a', 0, 'image/gif'),
+    (b'GIF89a', 0, 'image/gif'),
+    (b'WEBP', 8, 'image/webp'),
+    (b'BM', 0, 'image/bmp'),
+    (b'%PDF-', 0, 'application/pdf'),
+    (b'PK\x03\x04', 0, 'application/zip'),
+    (b'<svg', 0, 'image/svg+xml'),
+    (b'<?xml', 0, 'application/xml'),
+]
+_SNIFF_CHARS = 24  # -> 18 decoded bytes, enough for every signature above
+_WHITESPACE = ' \t\r\n'
+
+def _blob_payload_start(data) -> int:
+    """Offset of the base64 payload, skipping a "data:<mime>;base64," prefix if present."""
+    if data[:5] in ('data:', b'data:'):
+        comma = data.find(',' if isinstance(data, str) else b',', 0, 256)
+        return comma + 1 if comma != -1 else 0
+    return 0
+
+def _clean_base64(chunk):
+    """Drops line breaks/spaces from a chunk; only allocates when there are any."""
+    if isinstance(chunk, str):
+        return ''.join(chunk.split()) if any(c in chunk for c in _WHITESPACE) else chunk
+    chunk = bytes(chunk)
+    return b''.join(chunk.split()) if any(c in chunk for c in b' \t\r\n') else chunk
+
+def sniff_mime(header: bytes) -> str:
+    """Guesses a MIME type from the first bytes of a decoded blob."""
+    for magic, offset, mime in _MAGIC_NUMBERS:
+        if header[offset:offset + len(magic)] == magic:
+            return mime
+    return 'application/octet-stream'
+
+def blob_info(data) -> dict:
+    """Reports a base64 blob's decoded size and MIME type without decoding it.
+
+    Only the first few characters are decoded (for the MIME sniff); the size is derived
+    from the encoded length and padding, so unwrapped blobs cost O(1).
+
+    Args:
+        data (str | bytes): Base64 text as returned by the API, optionally a data: URI.
+
+    Returns:
+        dict: {'size': decoded bytes, 'mime': MIME type, 'encoded_length': payload characters}
+    """
+    if not data:
+        return {'size': 0, 'mime': None, 'encoded_length': 0}
+    start = _blob_payload_start(data)
+    whitespace = 0
+    head = data[start:start + 128]
+    if _clean_base64(head) != head:
+        # Line-wrapped base64 (MIME style) breaks within the first 76 chars; unwrapped blobs skip this scan
+        whitespace = sum(data.count(c, start) for c in (_WHITESPACE if isinstance(data, str) else b' \t\r\n'))
+    tail = data[max(start, len(data) - 8):].rstrip()
+    padding = len(tail) - len(tail.rstrip('=' if isinstance(data, str) else b'='))
+    encoded_length = len(data) - start - whitespace
+    head = _clean_base64(data[start:start + _SNIFF_CHARS * 2])[:_SNIFF_CHARS]
+    head = head[:len(head) - len(head) % 4]
+    try:
+        mime = sniff_mime(binascii.a2b_base64(head))
+    except binascii.Error:
+        mime = None
+    return {'size': encoded_length * 3 // 4 - padding, 'mime': mime, 'encoded_length': encoded_length}
+
+def blob_view(data) -> memoryview:
+    """Decodes a base64 blob into a read-only memoryview.
+
+    binascii reads an ASCII str in place, so for plain base64 the decoded bytes are the only
+    new copy (base64.b64decode would first re-encode the whole string to bytes).
+    """
+    start = _blob_payload_start(data)
+    return memoryview(binascii.a2b_base64(data[start:] if start else data)).toreadonly()
+
+def iter_blob_chunks(data, chunk_chars: int = 1 << 20) -> Iterator[bytes]:
+    """Decodes a base64 blob incrementally.
+
+    Args:
+        data (str | bytes): Base64 text, optionally a data: URI.
+        chunk_chars (int): Encoded characters decoded per step (rounded down to a multiple of 4).
+
+    Returns:
+        Iterator[bytes]: Decoded pieces of at most chunk_chars * 3 / 4 bytes each.
+    """
+    chunk_chars = max(4, chunk_chars - chunk_chars % 4)
+    pending = data[:0]
+    for pos in range(_blob_payload_start(data), len(data), chunk_chars):
+        chunk = pending + _clean_base64(data[pos:pos + chunk_chars])
+        usable = len(chunk) - len(chunk) % 4
+        pending = chunk[usable:]
+        if usable:
+            yield binascii.a2b_base64(chunk[:usable])
+    if pending:
+        raise ValueError("Truncated base64 blob")
+
+def save_blob(data, destination, chunk_chars: int = 1 << 20) -> dict:
+    """Decodes a base64 blob straight to a file, never holding the whole decoded payload.
+
+    Args:
+        data (str | bytes): Base64 text as returned by the API, optionally a data: URI.
+        destination (str | BinaryIO): Path to write, or a binary file-like object.
+        chunk_chars (int): Encoded characters decoded per write.
+
+    Returns:
+        dict: blob_info() of the blob, with 'size' being the bytes actually written.
+    """
+    info = blob_info(data)
+    if hasattr(destination, 'write'):
+        info['size'] = sum(destination.write(chunk) for chunk in iter_blob_chunks(data, chunk_chars))
+        return info
+    tmp_path = f"{destination}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            info['size'] = sum(f.write(chunk) for chunk in iter_blob_chunks(data, chunk_chars))
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return info
+
+# --- Structured output (JSONL / CSV / columnar) ---
+# Same payloads as the text formatters, minus the labels: rows keep the API's keys and
+# missing fields become None (JSON null, empty CSV cell) instead of 'N/A'.
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str,
+                                 check_circular=False)
+_json_line = _json_encoder.encode
+
+def _resolve_spec(formatter: Union[str, FormatterSpec]) -> FormatterSpec:
+    if isinstance(formatter, FormatterSpec):
+        return formatter
+    try:
+        return SPECS[formatter]
+    except KeyError:
+        raise ValueError(f"Unknown formatter: {formatter}") from None
+
+def _spec_keys(spec: FormatterSpec) -> tuple:
+    """API keys a 'records' or 'detail' spec shows, in display order."""
+    return spec.fields if spec.kind == 'records' else tuple(key for _, key in spec.fields)
+
+def _value_getter(keys: tuple) -> Callable:
+    """Returns item -> tuple of values for keys; itemgetter when every key is present."""
+    getter = itemgetter(*keys)
+    if len(keys) == 1:
+        return lambda item: (item.get(keys[0]),)
+
+    def values(item):
+        try:
+            return getter(item)
+        except KeyError:
+            return tuple([item.get(key) for key in keys])
+    return values
+
+def _flatten(record: dict, prefix: str = '') -> dict:
+    """Nested stats dicts become dotted columns: {'biaya': {'min': 1}} -> {'biaya.min': 1}."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def iter_records(formatter: Union[str, FormatterSpec], data,
+                 page: Optional[int] = None, page_size: Optional[int] = None) -> Iterator[dict]:
+    """Yields a formatter's payload as plain dict rows.
+
+    'records' layouts yield one row per item, restricted to the spec's fields; 'detail' and
+    'stats' layouts yield the single dict (stats lists yield their items); blobs yield blob_info().
+
+    Args:
+        formatter (str | FormatterSpec): Registry name or spec.
+        data: The API payload.
+        page (int, optional): 1-based page of rows.
+        page_size (int, optional): Rows per page.
+
+    Returns:
+        Iterator[dict]: The rows.
+    """
+    spec = _resolve_spec(formatter)
+    start, stop = _page_bounds(page, page_size)
+    if not data:
+        return iter(())
+    if spec.kind == 'records':
+        keys = spec.fields
+        values = _value_getter(keys)
+        return (dict(zip(keys, values(item))) for item in islice(data, start, stop))
+    if spec.kind == 'detail':
+        keys = _spec_keys(spec)
+        rows = [dict(zip(keys, _value_getter(keys)(data)))]
+    elif spec.kind == 'blob':
+        rows = [blob_info(data)]
+    elif isinstance(data, list):
+        rows = (item if isinstance(item, dict) else {'value': item} for item in data)
+    else:
+        rows = [data]
+    return islice(rows, start, stop)
+
+def iter_jsonl(formatter: Union[str, FormatterSpec], data,
+               page: Optional[int] = None, page_size: Optional[int] = None) -> Iterator[str]:
+    """Yields one compact JSON document (without newline) per row of iter_records()."""
+    return map(_json_line, iter_records(formatter, data, page, page_size))
+
+def write_jsonl(formatter: Union[str, FormatterSpec], data, file: TextIO, page: Optional[int] = None,
+                page_size: Optional[int] = None, chunk_lines: int = 1000) -> int:
+    """Writes iter_jsonl() to a text file-like object.
+
+    Returns:
+        int: Number of rows written.
+    """
+    lines = iter_jsonl(formatter, data, page, page_size)
+    count = 0
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            return count
+        count += len(chunk)
+        chunk.append("")
+        file.write("\n".join(chunk))
+
+def write_csv(formatter: Union[str, FormatterSpec], data, file: TextIO,
+              page: Optional[int] = None, page_size: Optional[int] = None) -> int:
+    """Writes a formatter's payload as CSV with a header row.
+
+    Columns are the spec's fields for 'records'/'detail' layouts, and the (dotted, flattened)
+    keys of the data otherwise. Open file with newline='' as the csv module expects.
+
+    Returns:
+        int: Number of data rows written.
+    """
+    spec = _resolve_spec(formatter)
+    writer = csv.writer(file)
+    if spec.kind == 'records':
+        start, stop = _page_bounds(page, page_size)
+        header = list(spec.fields)
+        rows = map(_value_getter(spec.fields), islice(data or (), start, stop))
+    else:
+        records = [_flatten(record) for record in iter_records(spec, data, page, page_size)]
+        header = list(dict.fromkeys(key for record in records for key in record))
+        rows = [[record.get(key) for key in header] for record in records]
+    writer.writerow(header)
+    count = 0
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+    return count
+
+def _column_array(values: tuple):
+    """Packs a column into an array when it is homogeneous numbers, else keeps a list."""
+    kinds = set(map(type, values))
+    if not kinds:
+        return []
+    try:
+        if kinds <= {int}:
+            return array('q', values)
+        if kinds <= {int, float}:
+            return array('d', values)
+    except OverflowError:
+        pass
+    return list(values)
+
+def to_columns(formatter: Union[str, FormatterSpec], data) -> dict:
+    """Converts a 'records' payload (e.g. the format_data_* aggregates) to columns.
+
+    Integer columns become array('q'), mixed int/float columns array('d'); anything else
+    (labels, values with gaps) stays a list.
+
+    Args:
+        formatter (str | FormatterSpec): Registry name or spec of a 'records' layout.
+        data (list): The API payload.
+
+    Returns:
+        dict: Field name -> column, in the spec's field order.
+    """
+    spec = _resolve_spec(formatter)
+    if spec.kind != 'records':
+        raise ValueError(f"Columnar export needs a list layout, not '{spec.kind}'")
+    columns = list(zip(*map(_value_getter(spec.fields), data or ()))) or [()] * len(spec.fields)
+    return {key: _column_array(column) for key, column in zip(spec.fields, columns)}
+
 # --- Perguruan Tinggi Formatters ---
 def format_pt_details(data: dict) -> str:
     """Formats the detailed information of a university."""
-    if not data:
-        return "Detail Perguruan Tinggi tidak ditemukan."
-    
-    title = "Detail Perguruan Tinggi"
-    output = [f"--- {title} ---"]
-    output.append(f"Nama PT      : {data.get('nama_pt', 'N/A')}")
-    output.append(f"Singkatan PT : {data.get('nm_singkat', 'N/A')}")
-    output.append(f"Kode PT      : {data.get('kode_pt', 'N/A')}")
-    output.append(f"Alamat       : {data.get('alamat', 'N/A')}")
-    output.append(f"Kota/Kab     : {data.get('kab_kota_pt', 'N/A')}")
-    output.append(f"Provinsi     : {data.get('provinsi_pt', 'N/A')}")
-    output.append(f"Website      : {data.get('website', 'N/A')}")
-    output.append(f"Email        : {data.get('email', 'N/A')}")
-    output.append(f"Telepon      : {data.get('no_tel', 'N/A')}")
-    output.append(f"Status       : {data.get('status_pt', 'N/A')}")
-    output.append(f"Akreditasi   : {data.get('akreditasi_pt', 'N/A')}")
-    output.append("-" * (len(title) + 8))
-    return "\n".join(output)
+    return FORMATTERS['pt_details'](data)
 
 def format_prodi_pt_list(data: list) -> str:
     """Formats a list of study programs from a university."""
-    if not data:
-        return "Program Studi tidak ditemukan untuk PT ini."
-    
-    fields = ['nama_prodi', 'jenjang_prodi', 'akreditasi', 'jumlah_mahasiswa', 'jumlah_dosen']
-    return _format_list_of_dicts(data, "Daftar Program Studi di PT", fields)
+    return FORMATTERS['prodi_pt_list'](data)
 
 def format_logo_pt(data: str) -> str:
     """Formats the base64 logo data."""
-    if not data:
-        return "Logo tidak ditemukan."
-    return f"Data Logo (base64) diterima. Panjang: {len(data)} karakter. Cuplikan: {data[:100]}..."
+    return FORMATTERS['logo_pt'](data)
 
 def format_rasio_pt(data: dict) -> str:
     """Formats the student-lecturer ratio of a university."""
-    if not data:
-        return "Rasio Mahasiswa & Dosen tidak ditemukan."
-    return _format_dict(data, "Rasio Mahasiswa & Dosen")
+    return FORMATTERS['rasio_pt'](data)
 
 def format_mahasiswa_pt_stats(data: dict) -> str:
     """Formats the student statistics of a university."""
-    if not data:
-        return "Statistik Mahasiswa tidak ditemukan."
-    return _format_dict(data, "Statistik Mahasiswa")
+    return FORMATTERS['mahasiswa_pt_stats'](data)
 
 def format_waktu_studi_pt(data: list) -> str:
     """Formats the average study time data for a university."""
-    if not data:
-        return "Data Waktu Studi tidak ditemukan."
-    fields = ['jenjang', 'mean_masa_studi']
-    return _format_list_of_dicts(data, "Rata-rata Waktu Studi PT", fields)
+    return FORMATTERS['waktu_studi_pt'](data)
 
 def format_name_histories_pt(data: list) -> str:
     """Formats the name history of a university."""
-    if not data:
-        return "Sejarah Nama PT tidak ditemukan."
-    fields = ['nama_lama', 'tanggal_perubahan'] # Assuming these fields based on common patterns
-    return _format_list_of_dicts(data, "Sejarah Nama Perguruan Tinggi", fields)
+    return FORMATTERS['name_histories_pt'](data)
 
 def format_cost_range_pt(data: dict) -> str:
     """Formats the cost range data for a university."""
-    if not data:
-        return "Kisaran Biaya Kuliah PT tidak ditemukan."
-    return _format_dict(data, "Kisaran Biaya Kuliah PT")
+    return FORMATTERS['cost_range_pt'](data)
 
 def format_graduation_rate_pt(data: dict) -> str:
     """Formats the graduation rate of a university."""
-    if not data:
-        return "Tingkat Kelulusan PT tidak ditemukan."
-    return _format_dict(data, "Tingkat Kelulusan PT")
+    return FORMATTERS['graduation_rate_pt'](data)
 
 def format_jumlah_prodi_pt(data: dict) -> str:
     """Formats the count of study programs in a university."""
-    if not data:
-        return "Jumlah Program Studi PT tidak ditemukan."
-    return _format_dict(data, "Jumlah Program Studi PT")
+    return FORMATTERS['jumlah_prodi_pt'](data)
 
 def format_jumlah_mahasiswa_pt(data: dict) -> str:
     """Formats the count of students in a university."""
-    if not data:
-        return "Jumlah Mahasiswa PT tidak ditemukan."
-    return _format_dict(data, "Jumlah Mahasiswa PT")
+    return FORMATTERS['jumlah_mahasiswa_pt'](data)
 
 def format_jumlah_dosen_pt(data: dict) -> str:
     """Formats the count of lecturers in a university."""
-    if not data:
-        return "Jumlah Dosen PT tidak ditemukan."
-    return _format_dict(data, "Jumlah Dosen PT")
+    return FORMATTERS['jumlah_dosen_pt'](data)
 
 def format_sarpras_file_name_pt(data: list) -> str:
     """Formats the sarpras file names for a university."""
-    if not data:
-        return "Nama File Sarpras tidak ditemukan."
-    fields = ['id_blob', 'file_name']
-    return _format_list_of_dicts(data, "Nama File Sarpras PT", fields)
+    return FORMATTERS['sarpras_file_name_pt'](data)
 
 def format_sarpras_blob_pt(data: str) -> str:
     """Formats the sarpras blob data."""
-    if not data:
-        return "Blob Sarpras tidak ditemukan."
-    return f"Data Blob Sarpras (base64) diterima. Panjang: {len(data)} karakter. Cuplikan: {data[:100]}..."
+    return FORMATTERS['sarpras_blob_pt'](data)
 
 # --- Dosen Formatters ---
 def format_dosen_profile(data: dict) -> str:
     """Formats the detailed profile of a lecturer."""
-    if not data:
-        return "Profil Dosen tidak ditemukan."
-    
-    title = "Profil Dosen"
-    output = [f"--- {title} ---"]
-    output.append(f"Nama Dosen        : {data.get('nama_dosen', 'N/A')}")
-    output.append(f"NIDN              : {data.get('nidn', 'N/A')}")
-    output.append(f"Jenis Kelamin     : {data.get('jenis_kelamin', 'N/A')}")
-    output.append(f"Jabatan Akademik  : {data.get('jabatan_akademik', 'N/A')}")
-    output.append(f"Pendidikan Tertinggi: {data.get('pendidikan_tertinggi', 'N/A')}")
-    output.append(f"Status Ikatan Kerja: {data.get('status_ikatan_kerja', 'N/A')}")
-    output.append(f"Status Aktivitas  : {data.get('status_aktivitas', 'N/A')}")
-    output.append(f"Nama PT           : {data.get('nama_pt', 'N/A')}")
-    output.append(f"Nama Prodi        : {data.get('nama_prodi', 'N/A')}")
-    output.append("-" * (len(title) + 8))
-    return "\n".join(output)
+    return FORMATTERS['dosen_profile'](data)
 
 def format_dosen_penelitian(data: list) -> str:
     """Formats a list of research activities for a lecturer."""
-    if not data:
-        return "Penelitian Dosen tidak ditemukan."
-    fields = ['judul_kegiatan', 'tahun_kegiatan', 'jenis_kegiatan']
-    return _format_list_of_dicts(data, "Penelitian Dosen", fields)
+    return FORMATTERS['dosen_penelitian'](data)
 
 def format_dosen_pengabdian(data: list) -> str:
     """Formats a list of community service activities for a lecturer."""
-    if not data:
-        return "Pengabdian Dosen tidak ditemukan."
-    fields = ['judul_kegiatan', 'tahun_kegiatan', 'jenis_kegiatan']
-    return _format_list_of_dicts(data, "Pengabdian Dosen", fields)
+    return FORMATTERS['dosen_pengabdian'](data)
 
 def format_dosen_karya(data: list) -> str:
     """Formats a list of academic works for a lecturer."""
-    if not data:
-        return "Karya Ilmiah Dosen tidak ditemukan."
-    fields = ['judul_kegiatan', 'tahun_kegiatan', 'jenis_kegiatan']
-    return _format_list_of_dicts(data, "Karya Ilmiah Dosen", fields)
+    return FORMATTERS['dosen_karya'](data)
 
 def format_dosen_paten(data: list) -> str:
     """Formats a list of patents for a lecturer."""
-    if not data:
-        return "Paten Dosen tidak ditemukan."
-    fields = ['judul_kegiatan', 'tahun_kegiatan', 'jenis_kegiatan']
-    return _format_list_of_dicts(data, "Paten Dosen", fields)
+    return FORMATTERS['dosen_paten'](data)
 
 def format_dosen_study_history(data: list) -> str:
     """Formats the study history of a lecturer."""
-    if not data:
-        return "Riwayat Studi Dosen tidak ditemukan."
-    fields = ['jenjang', 'bidang_studi', 'nama_pt', 'tahun_lulus']
-    return _format_list_of_dicts(data, "Riwayat Studi Dosen", fields)
+    return FORMATTERS['dosen_study_history'](data)
 
 def format_dosen_teaching_history(data: list) -> str:
     """Formats the teaching history of a lecturer."""
-    if not data:
-        return "Riwayat Mengajar Dosen tidak ditemukan."
-    fields = ['nama_semester', 'nama_matkul', 'nama_kelas', 'nama_pt']
-    return _format_list_of_dicts(data, "Riwayat Mengajar Dosen", fields)
+    return FORMATTERS['dosen_teaching_history'](data)
 
 # --- Mahasiswa Formatters ---
 def format_mahasiswa_details(data: dict) -> str:
     """Formats the detailed information of a student."""
-    if not data:
-        return "Detail Mahasiswa tidak ditemukan."
-    
-    title = "Detail Mahasiswa"
-    output = [f"--- {title} ---"]
-    output.append(f"Nama         : {data.get('nama', 'N/A')}")
-    output.append(f"NIM          : {data.get('nim', 'N/A')}")
-    output.append(f"Jenis Kelamin: {data.get('jenis_kelamin', 'N/A')}")
-    output.append(f"Tempat Lahir : {data.get('tempat_lahir', 'N/A')}")
-    output.append(f"Tgl. Lahir   : {data.get('tanggal_lahir', 'N/A')}")
-    output.append(f"Universitas  : {data.get('nama_pt', 'N/A')}")
-    output.append(f"Program Studi: {data.get('prodi', 'N/A')}")
-    output.append(f"Jenjang      : {data.get('jenjang', 'N/A')}")
-    output.append(f"Tgl. Masuk   : {data.get('tanggal_masuk', 'N/A')}")
-    output.append(f"Status       : {data.get('status_saat_ini', 'N/A')}")
-    output.append(f"Nama Ibu     : {data.get('nama_ibu', 'N/A')}")
-    output.append("-" * (len(title) + 8))
-    return "\n".join(output)
+    return FORMATTERS['mahasiswa_details'](data)
 
 # --- Program Studi Formatters ---
 def format_prodi_details(data: dict) -> str:
     """Formats the detailed information of a study program."""
-    if not data:
-        return "Detail Program Studi tidak ditemukan."
-    
-    title = "Detail Program Studi"
-    output = [f"--- {title} ---"]
-    output.append(f"Nama Prodi      : {data.get('nama_prodi', 'N/A')}")
-    output.append(f"Jenjang         : {data.get('jenj_didik', 'N/A')}")
-    output.append(f"Kode Prodi      : {data.get('kode_prodi', 'N/A')}")
-    output.append(f"Akreditasi      : {data.get('akreditasi', 'N/A')}")
-    output.append(f"Nama PT         : {data.get('nama_pt', 'N/A')}")
-    output.append(f"Tanggal Berdiri : {data.get('tgl_berdiri', 'N/A')}")
-    output.append(f"Status          : {data.get('status', 'N/A')}")
-    output.append(f"Email           : {data.get('email', 'N/A')}")
-    output.append(f"Website         : {data.get('website', 'N/A')}")
-    output.append("-" * (len(title) + 8))
-    return "\n".join(output)
+    return FORMATTERS['prodi_details'](data)
 
 def format_prodi_description(data: dict) -> str:
     """Formats the description of a study program."""
-    if not data:
-        return "Deskripsi Program Studi tidak ditemukan."
-    
-    title = "Deskripsi Program Studi"
-    output = [f"--- {title} ---"]
-    output.append(f"Deskripsi Singkat  : {data.get('deskripsi_singkat', 'N/A')}")
-    output.append(f"Visi               : {data.get('visi', 'N/A')}")
-    output.append(f"Misi               : {data.get('misi', 'N/A')}")
-    output.append(f"Kompetensi         : {data.get('kompetensi', 'N/A')}")
-    output.append(f"Capaian Belajar    : {data.get('capaian_belajar', 'N/A')}")
-    output.append("-" * (len(title) + 8))
-    return "\n".join(output)
+    return FORMATTERS['prodi_description'](data)
 
 def format_prodi_name_histories(data: list) -> str:
     """Formats the name history of a study program."""
-    if not data:
-        return "Sejarah Nama Program Studi tidak ditemukan."
-    fields = ['nama_lama', 'tanggal_perubahan'] # Assuming common fields
-    return _format_list_of_dicts(data, "Sejarah Nama Program Studi", fields)
+    return FORMATTERS['prodi_name_histories'](data)
 
 def format_prodi_num_students_lecturers(data: dict) -> str:
     """Formats the number of students and lecturers in a study program."""
-    if not data:
-        return "Jumlah Mahasiswa & Dosen Prodi tidak ditemukan."
-    return _format_dict(data, "Jumlah Mahasiswa & Dosen Prodi")
+    return FORMATTERS['prodi_num_students_lecturers'](data)
 
 def format_prodi_cost_range(data: dict) -> str:
     """Formats the cost range of a study program."""
-    if not data:
-        return "Kisaran Biaya Kuliah Prodi tidak ditemukan."
-    return _format_dict(data, "Kisaran Biaya Kuliah Prodi")
+    return FORMATTERS['prodi_cost_range'](data)
 
 def format_prodi_daya_tampung(data: dict) -> str:
     """Formats the capacity of a study program."""
-    if not data:
-        return "Daya Tampung Prodi tidak ditemukan."
-    return _format_dict(data, "Daya Tampung Prodi")
+    return FORMATTERS['prodi_daya_tampung'](data)
 
 def format_prodi_rasio_dosen_mahasiswa(data: dict) -> str:
     """Formats the student-lecturer ratio of a study program."""
-    if not data:
-        return "Rasio Dosen Mahasiswa Prodi tidak ditemukan."
-    return _format_dict(data, "Rasio Dosen Mahasiswa Prodi")
+    return FORMATTERS['prodi_rasio_dosen_mahasiswa'](data)
 
 def format_prodi_graduation_rate(data: dict) -> str:
     """Formats the graduation rate of a study program."""
-    if not data:
-        return "Tingkat Kelulusan Prodi tidak ditemukan."
-    return _format_dict(data, "Tingkat Kelulusan Prodi")
+    return FORMATTERS['prodi_graduation_rate'](data)
 
 def format_logo_prodi(data: str) -> str:
     """Formats the base64 logo data for a study program."""
-    if not data:
-        return "Logo Prodi tidak ditemukan."
-    return f"Data Logo Prodi (base64) diterima. Panjang: {len(data)} karakter. Cuplikan: {data[:100]}..."
+    return FORMATTERS['logo_prodi'](data)
 
 def format_homebase_prodi(data: dict) -> str:
     """Formats the homebase ratio of a study program."""
-    if not data:
-        return "Homebase Prodi tidak ditemukan."
-    return _format_dict(data, "Homebase Prodi")
+    return FORMATTERS['homebase_prodi'](data)
 
 def format_penghitung_ratio_prodi(data) -> str:
     """Formats the ratio counter of a study program."""
-    if not data:
-        return "Penghitung Rasio Prodi tidak ditemukan."
-
-    if isinstance(data, list):
-        title = "Penghitung Rasio Prodi"
-        output = [f"--- {title} ---"]
-        if not data:
-            output.append("Tidak ada data ditemukan.")
-        else:
-            for i, item in enumerate(data):
-                output.append(f"{i+1}. Data:")
-                if isinstance(item, dict):
-                    for key, value in item.items():
-                        output.append(f"   {key.replace('_', ' ').title()}: {value}")
-                else:
-                    output.append(f"   {item}")
-        output.append("-" * (len(title) + 8))
-        return "\n".join(output)
-
-    return _format_dict(data, "Penghitung Rasio Prodi")
+    return FORMATTERS['penghitung_ratio_prodi'](data)
 
 # --- Statistik & Visualisasi Formatters ---
 def format_dosen_count_active(data: dict) -> str:
     """Formats the active lecturer count."""
-    if not data:
-        return "Jumlah Dosen Aktif tidak ditemukan."
-    return _format_dict(data, "Jumlah Dosen Aktif")
+    return FORMATTERS['dosen_count_active'](data)
 
 def format_mahasiswa_count_active(data: dict) -> str:
     """Formats the active student count."""
-    if not data:
-        return "Jumlah Mahasiswa Aktif tidak ditemukan."
-    return _format_dict(data, "Jumlah Mahasiswa Aktif")
+    return FORMATTERS['mahasiswa_count_active'](data)
 
 def format_prodi_count(data: dict) -> str:
     """Formats the study program count."""
-    if not data:
-        return "Jumlah Program Studi tidak ditemukan."
-    return _format_dict(data, "Jumlah Program Studi")
+    return FORMATTERS['prodi_count'](data)
 
 def format_pt_count(data: dict) -> str:
     """Formats the university count."""
-    if not data:
-        return "Jumlah Perguruan Tinggi tidak ditemukan."
-    return _format_dict(data, "Jumlah Perguruan Tinggi")
+    return FORMATTERS['pt_count'](data)
 
 def format_data_dosen_keaktifan(data: list) -> str:
     """Formats the lecturer activeness visualization data."""
-    if not data:
-        return "Data Keaktifan Dosen tidak ditemukan."
-    fields = ['status_keaktifan', 'jumlah_dosen']
-    return _format_list_of_dicts(data, "Visualisasi Keaktifan Dosen", fields)
+    return FORMATTERS['data_dosen_keaktifan'](data)
 
 def format_data_dosen_bidang(data: list) -> str:
     """Formats the lecturer field of study visualization data."""
-    if not data:
-        return "Data Dosen Berdasarkan Bidang tidak ditemukan."
-    fields = ['bidang', 'jumlah_dosen']
-    return _format_list_of_dicts(data, "Visualisasi Dosen Berdasarkan Bidang", fields)
+    return FORMATTERS['data_dosen_bidang'](data)
 
 def format_data_dosen_jenis_kelamin(data: list) -> str:
     """Formats the lecturer gender visualization data."""
-    if not data:
-        return "Data Dosen Berdasarkan Jenis Kelamin tidak ditemukan."
-    fields = ['jenis_kelamin', 'jumlah']
-    return _format_list_of_dicts(data, "Visualisasi Dosen Berdasarkan Jenis Kelamin", fields)
+    return FORMATTERS['data_dosen_jenis_kelamin'](data)
 
 def format_data_dosen_jenjang(data: list) -> str:
     """Formats the lecturer education level visualization data."""
-    if not data:
-        return "Data Dosen Berdasarkan Jenjang tidak ditemukan."
-    fields = ['jenjang_dosen', 'jumlah_dosen']
-    return _format_list_of_dicts(data, "Visualisasi Dosen Berdasarkan Jenjang", fields)
+    return FORMATTERS['data_dosen_jenjang'](data)
 
 def format_data_dosen_ikatan(data: list) -> str:
     """Formats the lecturer employment bond visualization data."""
-    if not data:
-        return "Data Dosen Berdasarkan Ikatan tidak ditemukan."
-    fields = ['ikatan_dosen', 'jumlah']
-    return _format_list_of_dicts(data, "Visualisasi Dosen Berdasarkan Ikatan", fields)
+    return FORMATTERS['data_dosen_ikatan'](data)
 
 def format_data_mahasiswa_bidang(data: list) -> str:
     """Formats the student field of study visualization data."""
-    if not data:
-        return "Data Mahasiswa Berdasarkan Bidang tidak ditemukan."
-    fields = ['bidang', 'jumlah_mhs']
-    return _format_list_of_dicts(data, "Visualisasi Mahasiswa Berdasarkan Bidang", fields)
+    return FORMATTERS['data_mahasiswa_bidang'](data)
 
 def format_data_mahasiswa_jenis_kelamin(data: list) -> str:
     """Formats the student gender visualization data."""
-    if not data:
-        return "Data Mahasiswa Berdasarkan Jenis Kelamin tidak ditemukan."
-    fields = ['jenis_kelamin', 'jumlah_mhs']
-    return _format_list_of_dicts(data, "Visualisasi Mahasiswa Berdasarkan Jenis Kelamin", fields)
+    return FORMATTERS['data_mahasiswa_jenis_kelamin'](data)
 
 def format_data_mahasiswa_jenjang(data: list) -> str:
     """Formats the student education level visualization data."""
-    if not data:
-        return "Data Mahasiswa Berdasarkan Jenjang tidak ditemukan."
-    fields = ['nama_jenjang', 'jumlah_mhs']
-    return _format_list_of_dicts(data, "Visualisasi Mahasiswa Berdasarkan Jenjang", fields)
+    return FORMATTERS['data_mahasiswa_jenjang'](data)
 
 def format_data_mahasiswa_kelompok_lembaga(data: list) -> str:
     """Formats the student institutional group visualization data."""
-    if not data:
-        return "Data Mahasiswa Berdasarkan Kelompok Lembaga tidak ditemukan."
-    fields = ['kelompok_lembaga', 'jumlah_mhs']
-    return _format_list_of_dicts(data, "Visualisasi Mahasiswa Berdasarkan Kelompok Lembaga", fields)
+    return FORMATTERS['data_mahasiswa_kelompok_lembaga'](data)
 
 def format_data_mahasiswa_status(data: list) -> str:
     """Formats the student status visualization data."""
-    if not data:
-        return "Data Mahasiswa Berdasarkan Status tidak ditemukan."
-    fields = ['status_mahasiswa', 'jumlah']
-    return _format_list_of_dicts(data, "Visualisasi Mahasiswa Berdasarkan Status", fields)
+    return FORMATTERS['data_mahasiswa_status'](data)
 
 def format_data_pt_bentuk(data: list) -> str:
     """Formats the university type visualization data."""
-    if not data:
-        return "Data Perguruan Tinggi Berdasarkan Bentuk tidak ditemukan."
-    fields = ['bentuk_pt', 'jumlah_pt']
-    return _format_list_of_dicts(data, "Visualisasi Perguruan Tinggi Berdasarkan Bentuk", fields)
+    return FORMATTERS['data_pt_bentuk'](data)
 
 def format_data_pt_akreditasi(data: list) -> str:
     """Formats the university accreditation visualization data."""
-    if not data:
-        return "Data Perguruan Tinggi Berdasarkan Akreditasi tidak ditemukan."
-    fields = ['akreditasi', 'jumlah_pt']
-    return _format_list_of_dicts(data, "Visualisasi Perguruan Tinggi Berdasarkan Akreditasi", fields)
+    return FORMATTERS['data_pt_akreditasi'](data)
 
 def format_data_pt_kelompok_pembina(data: list) -> str:
     """Formats the university administrative overseer group visualization data."""
-    if not data:
-        return "Data Perguruan Tinggi Berdasarkan Kelompok Pembina tidak ditemukan."
-    fields = ['kelompok_pembina', 'jumlah_pt']
-    return _format_list_of_dicts(data, "Visualisasi Perguruan Tinggi Berdasarkan Kelompok Pembina", fields)
+    return FORMATTERS['data_pt_kelompok_pembina'](data)
 
 def format_data_pt_provinsi(data: list) -> str:
     """Formats the university province visualization data."""
-    if not data:
-        return "Data Perguruan Tinggi Berdasarkan Provinsi tidak ditemukan."
-    fields = ['provinsi', 'jumlah_pt']
-    return _format_list_of_dicts(data, "Visualisasi Perguruan Tinggi Berdasarkan Provinsi", fields)
+    return FORMATTERS['data_pt_provinsi'](data)
 
 def format_data_prodi_jenjang(data: list) -> str:
     """Formats the study program education level visualization data."""
-    if not data:
-        return "Data Program Studi Berdasarkan Jenjang tidak ditemukan."
-    fields = ['jenjang_prodi', 'jumlah_prodi']
-    return _format_list_of_dicts(data, "Visualisasi Program Studi Berdasarkan Jenjang", fields)
+    return FORMATTERS['data_prodi_jenjang'](data)
 
 def format_data_prodi_akreditasi(data: list) -> str:
     """Formats the study program accreditation visualization data."""
-    if not data:
-        return "Data Program Studi Berdasarkan Akreditasi tidak ditemukan."
-    fields = ['akreditasi_prodi', 'jumlah_prodi']
-    return _format_list_of_dicts(data, "Visualisasi Program Studi Berdasarkan Akreditasi", fields)
+    return FORMATTERS['data_prodi_akreditasi'](data)
 
 def format_data_prodi_bidang_ilmu(data: list) -> str:
     """Formats the study program field of study visualization data."""
-    if not data:
-        return "Data Program Studi Berdasarkan Bidang Ilmu tidak ditemukan."
-    fields = ['bidang_ilmu', 'jumlah_prodi']
-    return _format_list_of_dicts(data, "Visualisasi Program Studi Berdasarkan Bidang Ilmu", fields)
+    return FORMATTERS['data_prodi_bidang_ilmu'](data)
 
 def format_data_prodi_kelompok_pembina(data: list) -> str:
     """Formats the study program administrative overseer group visualization data."""
-    if not data:
-        return "Data Program Studi Berdasarkan Kelompok Pembina tidak ditemukan."
-    fields = ['kelompok_pembina', 'jumlah_prodi']
-    return _format_list_of_dicts(data, "Visualisasi Program Studi Berdasarkan Kelompok Pembina", fields)
+    return FORMATTERS['data_prodi_kelompok_pembina'](data)
 
 # --- Search Results Formatters (for initial search lists) ---
 def format_search_results(data: list, title: str, fields: list) -> str:
     """Formats a generic list of search results."""
-    if not data:
-        return f"Tidak ada {title} yang ditemukan."
-    
-    output = [f"--- Hasil Pencarian {title} ---"]
-    for i, item in enumerate(data):
-        output.append(f"{i + 1}. ")
-        for field in fields:
-            output.append(f"  {field.replace('_', ' ').title()}: {item.get(field, 'N/A')}")
-    output.append("-" * (len(title) + 20))
-    return "\n".join(output)
+    return _search_results_formatter(title, tuple(fields))(data)
+
+def iter_search_results(data, title: str, fields: list,
+                        page: Optional[int] = None, page_size: Optional[int] = None) -> Iterator[str]:
+    """Streaming/paginated variant of format_search_results."""
+    return iter_format(_search_results_formatter(title, tuple(fields)), data, page, page_size)
 
 def format_search_dosen(data: list) -> str:
     """Formats the search results for lecturers."""
-    fields = ['nama', 'nidn', 'nama_pt', 'nama_prodi']
-    return _format_list_of_dicts(data, "Dosen", fields)
+    return FORMATTERS['search_dosen'](data)
 
 def format_search_mahasiswa(data: list) -> str:
     """Formats the search results for students."""
-    fields = ['nama', 'nim', 'nama_pt', 'nama_prodi']
-    return _format_list_of_dicts(data, "Mahasiswa", fields)
+    return FORMATTERS['search_mahasiswa'](data)
 
 def format_search_pt(data: list) -> str:
     """Formats the search results for universities."""
-    fields = ['nama', 'kode', 'nama_singkat']
-    return _format_list_of_dicts(data, "Perguruan Tinggi", fields)
+    return FORMATTERS['search_pt'](data)
 
 def format_search_prodi(data: list) -> str:
     """Formats the search results for study programs."""
-    fields = ['nama', 'jenjang', 'pt']
-    return _format_list_of_dicts(data, "Program Studi", fields)
+    return FORMATTERS['search_prodi'](data)
 
 # --- Data Umum Formatters ---
 def format_contributor_list(data: list) -> str:
     """Formats the list of contributors."""
-    if not data:
-        return "Daftar Kontributor tidak ditemukan."
-    fields = ['name', 'role', 'universitas', 'linkedin']
-    return _format_list_of_dicts(data, "Daftar Kontributor", fields)
+    return FORMATTERS['contributor_list'](data)
 
 def format_news_list(data: list) -> str:
     """Formats the list of news articles."""
-    if not data:
-        return "Daftar Berita tidak ditemukan."
-    fields = ['title', 'date', 'url'] # Assuming 'url' field based on common news API responses
-    return _format_list_of_dicts(data, "Daftar Berita", fields)
+    return FORMATTERS['news_list'](data)
 
 def format_bidang_ilmu_prodi(data: list) -> str:
     """Formats the list of study program fields of science."""
-    if not data:
-        return "Daftar Bidang Ilmu Prodi tidak ditemukan."
-    fields = ['nama'] # Assuming field is 'nama' for the name of the field
-    return _format_list_of_dicts(data, "Daftar Bidang Ilmu Program Studi", fields)
+    return FORMATTERS['bidang_ilmu_prodi'](data)
+
+
+# --- Benchmark ---
+def _format_rows_uncompiled(data: list, title: str, fields: list) -> str:
+    """The pre-registry row loop (labels rebuilt per field per row), kept as the benchmark baseline."""
+    output = [f"--- {title} ---"]
+    for i, item in enumerate(data):
+        item_details = []
+        for field in fields:
+            item_details.append(f"{field.replace('_', ' ').title()}: {item.get(field, 'N/A')}")
+        output.append(f"{i+1}. {', '.join(item_details)}")
+    output.append("-" * (len(title) + 8))
+    return "\n".join(output)
 
+def benchmark(rows: int = 100_000, repeat_count: int = 3):
+    """Prints the per-row cost of a list formatter before and after compilation.
+
+    Args:
+        rows (int): Number of synthetic rows to format.
+        repeat_count (int): Runs per variant; the best one is reported.
+    """
+    spec = SPECS['prodi_pt_list']
+    data = [{'nama_prodi': f"Prodi {i}", 'jenjang_prodi': 'S1', 'akreditasi': 'A',
+             'jumlah_mahasiswa': i % 1000, 'jumlah_dosen': i % 50} for i in range(rows)]
+    variants = [
+        ("uncompiled", lambda: _format_rows_uncompiled(data, spec.title, list(spec.fields))),
+        ("compiled", lambda: FORMATTERS['prodi_pt_list'](data)),
+    ]
+    results = {}
+    for name, run in variants:
+        best = float('inf')
+        for _ in range(repeat_count):
+            start = time.perf_counter()
+            results[name] = run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>10}: {best:.3f}s total, {best / rows * 1e6:.2f} us/row")
+    if results['uncompiled'] != results['compiled']:
+        print("WARNING: outputs differ")
+
+def benchmark_blobs(size_mb: int = 8):
+    """Prints time and peak traced memory of saving a multi-MB sarpras blob, before and after.
+
+    Args:
+        size_mb (int): Decoded size of the synthetic blob.
+    """
+    import tempfile
+    import tracemalloc
+
+    payload = b'%PDF-1.7\n' + os.urandom(size_mb * 1024 * 1024)
+    data = base64.b64encode(payload).decode('ascii')
+    del payload
+
+    def decode_whole(path):
+        decoded = base64.b64decode(data)
+        with open(path, 'wb') as f:
+            f.write(decoded)
+        return {'size': len(decoded)}
+
+    variants = [
+        ("b64decode", decode_whole),
+        ("save_blob", lambda path: save_blob(data, path)),
+        ("blob_info", lambda path: blob_info(data)),
+    ]
+    print(f"blob: {len(data) / 1e6:.1f} MB of base64 ({blob_info(data)['mime']})")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sarpras.pdf')
+        for name, run in variants:
+            tracemalloc.start()
+            start = time.perf_counter()
+            size = run(path)['size']
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:>10}: {elapsed * 1000:.1f} ms, peak {peak / 1e6:.2f} MB, {size} bytes")
+
+def _parse_text_rows(text: str) -> list:
+    """What pipelines did with the text output: split the numbered lines back into dicts."""
+    rows = []
+    for line in text.split("\n")[1:-1]:
+        _, _, fields = line.partition(". ")
+        rows.append(dict(field.split(": ", 1) for field in fields.split(", ")))
+    return rows
+
+def benchmark_structured(rows: int = 100_000, repeat_count: int = 3):
+    """Prints the cost of exporting a visualisation aggregate as text (+ re-parse) vs structured.
+
+    Args:
+        rows (int): Number of synthetic aggregate rows.
+        repeat_count (int): Runs per variant; the best one is reported.
+    """
+    import io
+
+    name = 'data_mahasiswa_bidang'
+    data = [{'bidang': f"Bidang {i}", 'jumlah_mhs': i * 7 % 100_000} for i in range(rows)]
+    variants = [
+        ("text", lambda: FORMATTERS[name](data)),
+        ("text+parse", lambda: _parse_text_rows(FORMATTERS[name](data))),
+        ("jsonl", lambda: write_jsonl(name, data, io.StringIO())),
+        ("csv", lambda: write_csv(name, data, io.StringIO(newline=''))),
+        ("columns", lambda: to_columns(name, data)),
+    ]
+    for label, run in variants:
+        best = float('inf')
+        for _ in range(repeat_count):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:>10}: {best:.3f}s total, {best / rows * 1e6:.2f} us/row")
@@ -1,77 +1,755 @@
 import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
 import os
+import signal
+import socket
+import socketserver
+import subprocess
 import sys
+import tempfile
+import time
 import warnings
 
 # Filter warning agar output lebih bersih
 warnings.filterwarnings("ignore")
 
-try:
-    import whisper
-except ImportError:
-    print("Error: Pustaka 'openai-whisper' belum terinstall.")
-    print("Silakan install dengan menjalankan: pip install openai-whisper")
-    sys.exit(1)
+MEDIA_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm", ".avi", ".mp3", ".wav", ".m4a", ".ogg", ".flac")
 
-def transcribe_video(video_path, model_size="small", language=None):
+# Whisper bekerja pada audio mono 16 kHz
+SAMPLE_RATE = 16000
+
+# Resolusi energi untuk pencarian titik hening; potongan minimal dua frame
+SILENCE_FRAME_SECONDS = 0.1
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "transcribe_video")
+DEFAULT_CACHE_SIZE_MB = 256
+
+
+def _import_whisper():
+    """
+    Mengimpor whisper hanya saat model benar-benar dibutuhkan.
+
+    Mode klien (--serve tersedia) tidak perlu memuat whisper/torch sama sekali.
+    """
+    try:
+        import whisper
+    except ImportError:
+        print("Error: Pustaka 'openai-whisper' belum terinstall.")
+        print("Silakan install dengan menjalankan: pip install openai-whisper")
+        sys.exit(1)
+    return whisper
+
+
+def default_socket_path(model_size):
+    """Path socket UNIX default untuk worker dengan ukuran model tertentu."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"transcribe_video-{model_size}.sock")
+
+
+def load_model(model_size):
+    """
+    Memuat model Whisper dan mencatat lama waktunya.
+
+    Returns:
+        tuple: (model, detik yang dibutuhkan untuk memuat model)
+    """
+    whisper = _import_whisper()
+    print(f"Sedang memuat model '{model_size}' (ini mungkin memakan waktu)...")
+    started = time.perf_counter()
+    model = whisper.load_model(model_size)
+    load_seconds = time.perf_counter() - started
+    print(f"Model dimuat dalam {load_seconds:.2f} detik.")
+    return model, load_seconds
+
+
+def _whisper_version():
+    """
+    Versi whisper tanpa mengimpor pustakanya (impor torch memakan waktu).
+
+    Tanpa metadata paket (mis. whisper dari PYTHONPATH) versinya diambil dari
+    whisper.__version__, supaya hasil versi lain tidak berbagi kunci cache.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("openai-whisper")
+    except PackageNotFoundError:
+        return _import_whisper().__version__
+
+
+def decode_audio(video_path):
+    """
+    Mendekode audio dengan ffmpeg ke PCM 16-bit mono 16 kHz, seperti whisper.
+
+    Returns:
+        tuple: (SHA-256 dari PCM hasil dekode, bytes PCM)
+    """
+    result = subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-i", video_path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        capture_output=True,
+        check=True,
+    )
+    return hashlib.sha256(result.stdout).hexdigest(), result.stdout
+
+
+class TranscriptCache:
+    """
+    Cache transkrip di disk, satu file JSON per entri.
+
+    Kunci dibentuk dari hash audio hasil dekode (bukan byte kontainer, jadi
+    hasil remux/rename tetap cocok), ukuran model, bahasa dan versi whisper.
+    Entri yang paling lama tidak dipakai dihapus saat ukuran cache melebihi
+    batas.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, audio_digest, model_size, language):
+        raw = f"{audio_digest}:{model_size}:{language or 'auto'}:{_whisper_version()}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Mengembalikan {"text", "segments"} atau None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Perbarui waktu akses untuk eviction LRU
+        os.utime(path)
+        return entry
+
+    def put(self, key, text, segments):
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"text": text, "segments": segments}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+
+def _write_text_output(video_path, text):
+    # Simpan hasil ke file .txt
+    base_name = os.path.splitext(video_path)[0]
+    output_file = f"{base_name}_transcript.txt"
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    return output_file
+
+
+def transcribe_file(model, video_path, language=None, audio=None):
+    """
+    Mentranskrip satu file dengan model yang sudah dimuat.
+
+    Args:
+        audio (bytes, optional): PCM hasil decode_audio(); jika ada, audio
+            tidak didekode ulang oleh whisper.
+
+    Returns:
+        dict: path file hasil, teks, segmen dan lama transkripsi (detik).
+    """
+    # Opsi transkripsi
+    # fp16=False digunakan agar kompatibel dengan CPU jika tidak ada GPU
+    options = {"fp16": False}
+    if language:
+        options["language"] = language
+
+    source = video_path
+    if audio is not None:
+        import numpy as np
+        source = np.frombuffer(audio, np.int16).astype(np.float32) / 32768.0
+
+    started = time.perf_counter()
+    result = model.transcribe(source, **options)
+    seconds = time.perf_counter() - started
+
+    transcribed_text = result["text"]
+    segments = [{"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                for seg in result.get("segments", [])]
+    output_file = _write_text_output(video_path, transcribed_text)
+
+    return {"output_file": output_file, "text": transcribed_text, "segments": segments,
+            "seconds": seconds}
+
+
+def transcribe_cached(get_model, video_path, model_size, language=None, cache=None):
+    """
+    Seperti transcribe_file, tetapi memeriksa cache terlebih dahulu.
+
+    Args:
+        get_model (callable): Mengembalikan model; hanya dipanggil saat cache miss.
+
+    Returns:
+        dict: seperti transcribe_file, ditambah "cached" (bool).
+    """
+    if cache is None:
+        return {**transcribe_file(get_model(), video_path, language), "cached": False}
+
+    digest, audio = decode_audio(video_path)
+    key = cache.key(digest, model_size, language)
+    entry = cache.get(key)
+    if entry is not None:
+        output_file = _write_text_output(video_path, entry["text"])
+        return {"output_file": output_file, "text": entry["text"],
+                "segments": entry["segments"], "seconds": 0.0, "cached": True}
+
+    result = transcribe_file(get_model(), video_path, language, audio)
+    cache.put(key, result["text"], result["segments"])
+    return {**result, "cached": False}
+
+
+def _print_result(video_path, result):
+    print("\n--- Transkripsi Selesai ---")
+    print(f"File: {video_path}")
+    if result.get("cached"):
+        print("Waktu transkripsi: 0.00 detik (diambil dari cache)")
+    else:
+        print(f"Waktu transkripsi: {result['seconds']:.2f} detik")
+    print(f"Hasil disimpan di: {result['output_file']}")
+
+    # Tampilkan sedikit preview
+    print("\nPreview (100 karakter pertama):")
+    print(result["text"][:100] + "...")
+
+
+def collect_media(paths):
+    """Mengembangkan daftar file/direktori menjadi daftar file media."""
+    media = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                media.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.lower().endswith(MEDIA_EXTENSIONS))
+        else:
+            media.append(path)
+    return media
+
+
+def transcribe_video(video_path, model_size="small", language=None, cache=None):
     """
     Mentranskrip video ke teks menggunakan OpenAI Whisper.
     """
-    if not os.path.exists(video_path):
-        print(f"Error: File '{video_path}' tidak ditemukan.")
+    transcribe_batch([video_path], model_size, language, cache)
+
+
+class _ModelLoadError(Exception):
+    pass
+
+
+def transcribe_batch(video_paths, model_size="small", language=None, cache=None):
+    """
+    Mentranskrip banyak file dengan satu kali pemuatan model.
+
+    Dengan cache, model baru dimuat saat ada file yang belum pernah
+    ditranskrip.
+    """
+    existing = []
+    for video_path in video_paths:
+        if os.path.exists(video_path):
+            existing.append(video_path)
+        else:
+            print(f"Error: File '{video_path}' tidak ditemukan.")
+    if not existing:
         return
 
     print(f"--- Memulai Transkripsi ---")
-    print(f"File: {video_path}")
+    print(f"Jumlah file: {len(existing)}")
     print(f"Model: {model_size}")
-    
+
     if language:
         print(f"Bahasa dipaksa ke: {language}")
     else:
         print("Bahasa: Auto-detect (Akan mendeteksi bahasa dominan)")
 
-    print("Sedang memuat model (ini mungkin memakan waktu)...")
-    
+    loaded = {}
+
+    def get_model():
+        if "model" not in loaded:
+            try:
+                # Load model
+                loaded["model"], loaded["seconds"] = load_model(model_size)
+            except Exception as e:
+                raise _ModelLoadError(e) from e
+        return loaded["model"]
+
+    total_seconds = 0.0
+    cached = 0
+    for video_path in existing:
+        print(f"\nSedang memproses transkripsi: {video_path}")
+        try:
+            result = transcribe_cached(get_model, video_path, model_size, language, cache)
+        except _ModelLoadError as e:
+            print(f"\nTerjadi kesalahan saat memuat model: {e}")
+            return
+        except Exception as e:
+            print(f"\nTerjadi kesalahan: {e}")
+            continue
+        total_seconds += result["seconds"]
+        cached += result["cached"]
+        _print_result(video_path, result)
+
+    print("\n--- Ringkasan Waktu ---")
+    if "model" in loaded:
+        print(f"Memuat model  : {loaded['seconds']:.2f} detik")
+    else:
+        print("Memuat model  : 0.00 detik (tidak diperlukan, semua dari cache)")
+    print(f"Transkripsi   : {total_seconds:.2f} detik ({len(existing)} file, {cached} dari cache)")
+
+
+# --- Mode chunked: audio dipotong di bagian hening dan ditranskrip paralel ---
+
+def extract_audio(video_path, pcm_path):
+    """Mengekstrak audio sekali saja sebagai PCM 16-bit mono 16 kHz mentah."""
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", video_path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), pcm_path],
+        check=True,
+    )
+
+
+def split_at_silence(samples, chunk_seconds, search_seconds=30,
+                     frame_seconds=SILENCE_FRAME_SECONDS):
+    """
+    Menentukan batas potongan di titik paling hening dekat setiap target durasi.
+
+    Args:
+        samples (numpy.ndarray): Audio PCM int16 (boleh berupa memmap).
+        chunk_seconds (float): Target durasi tiap potongan, minimal dua frame.
+        search_seconds (float): Jangkauan pencarian hening di sekitar target.
+        frame_seconds (float): Resolusi pengukuran energi.
+
+    Returns:
+        list: Indeks sampel batas potongan, diawali 0 dan diakhiri jumlah sampel.
+    """
+    frames_per_chunk = int(chunk_seconds / frame_seconds)
+    if frames_per_chunk < 2:
+        # Dengan kurang dari dua frame batas berikutnya bisa jatuh di titik yang sama
+        raise ValueError(f"chunk_seconds minimal {2 * frame_seconds} detik")
+    import numpy as np
+
+    frame = int(SAMPLE_RATE * frame_seconds)
+    num_frames = len(samples) // frame
+    energy = np.empty(num_frames, dtype=np.float32)
+    # Energi dihitung per blok agar audio panjang tidak dimuat sekaligus
+    block_frames = 600
+    for first in range(0, num_frames, block_frames):
+        last = min(first + block_frames, num_frames)
+        block = np.asarray(samples[first * frame:last * frame], dtype=np.float32)
+        energy[first:last] = np.square(block).reshape(last - first, frame).mean(axis=1)
+
+    bounds = [0]
+    # Jangkauan dibatasi setengah potongan agar tidak ada potongan yang terlalu pendek
+    search = max(1, min(int(search_seconds / frame_seconds), frames_per_chunk // 2))
+    target = frames_per_chunk
+    while target + search < num_frames:
+        low = target - search
+        quietest = low + int(np.argmin(energy[low:target + search]))
+        bounds.append(quietest * frame)
+        target = quietest + frames_per_chunk
+    bounds.append(len(samples))
+    return bounds
+
+
+def chunk_minutes(value):
+    """Tipe argparse untuk --chunk-minutes: positif dan tidak lebih pendek dari dua frame energi."""
+    minutes = float(value)
+    if not 2 * SILENCE_FRAME_SECONDS <= minutes * 60 < float("inf"):
+        raise argparse.ArgumentTypeError(
+            f"harus minimal {2 * SILENCE_FRAME_SECONDS} detik ({2 * SILENCE_FRAME_SECONDS / 60:.4f} menit)")
+    return minutes
+
+
+_CHUNK_MODEL = None
+_CHUNK_ERROR = None
+
+
+def _init_chunk_worker(model_size, threads):
+    """
+    Memuat model sekali per proses worker.
+
+    Kegagalan tidak boleh lolos dari initializer: Pool akan terus
+    menjalankan ulang worker dan imap_unordered tidak pernah selesai.
+    Kesalahannya disimpan dan dilaporkan oleh _transcribe_chunk().
+    """
+    global _CHUNK_MODEL, _CHUNK_ERROR
+    # Ctrl+C ditangani oleh proses induk
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        import torch
+        import whisper
+        torch.set_num_threads(threads)
+        _CHUNK_MODEL = whisper.load_model(model_size)
+    except BaseException as e:
+        _CHUNK_ERROR = f"gagal memuat model '{model_size}' di worker: {e!r}"
+
+
+def _transcribe_chunk(job):
+    """Mentranskrip satu potongan audio; timestamp relatif terhadap awal potongan."""
+    if _CHUNK_MODEL is None:
+        raise RuntimeError(_CHUNK_ERROR)
+    import numpy as np
+
+    index, pcm_path, start, end, language = job
+    samples = np.memmap(pcm_path, dtype=np.int16, mode="r")
+    audio = np.asarray(samples[start:end], dtype=np.float32) / 32768.0
+    options = {"fp16": False}
+    if language:
+        options["language"] = language
+    result = _CHUNK_MODEL.transcribe(audio, **options)
+    return index, [(seg["start"], seg["end"], seg["text"].strip()) for seg in result["segments"]]
+
+
+def _timestamp(seconds, separator="."):
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _format_segment(output_format, index, start, end, text):
+    if output_format == "srt":
+        return f"{index}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n{text}\n\n"
+    if output_format == "vtt":
+        return f"{_timestamp(start)} --> {_timestamp(end)}\n{text}\n\n"
+    return f"[{_timestamp(start)} --> {_timestamp(end)}] {text}\n"
+
+
+def _save_state(state_file, state):
+    temp_file = f"{state_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temp_file, state_file)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_segments(output_file, output_format, segments):
+    """Menulis seluruh segmen (misalnya dari cache) ke file hasil sekaligus."""
+    with open(output_file, "w", encoding="utf-8") as out:
+        if output_format == "vtt":
+            out.write("WEBVTT\n\n")
+        for index, seg in enumerate(segments, 1):
+            out.write(_format_segment(output_format, index, seg["start"], seg["end"],
+                                      seg["text"].strip()))
+
+
+def transcribe_chunked(video_path, model_size="small", language=None, jobs=None,
+                       chunk_minutes=10, output_format="txt", cache=None):
+    """
+    Mentranskrip video panjang per potongan secara paralel.
+
+    Audio diekstrak sekali, dipotong di bagian hening, lalu tiap potongan
+    ditranskrip oleh proses worker (masing-masing memuat model sendiri).
+    Segmen ditulis ke file hasil sesuai urutan begitu potongannya selesai,
+    dan kemajuan dicatat di file .progress.json sehingga proses yang
+    terhenti (crash/Ctrl+C) dapat dilanjutkan dengan menjalankan ulang
+    perintah yang sama.
+    """
+    import numpy as np
+
+    if not os.path.exists(video_path):
+        print(f"Error: File '{video_path}' tidak ditemukan.")
+        return
+
+    # Pastikan whisper ada sebelum worker dibuat; pesan kesalahannya jelas di sini
+    _import_whisper()
+    jobs = jobs or max(1, (os.cpu_count() or 2) // 2)
+    base_name = os.path.splitext(video_path)[0]
+    output_file = f"{base_name}_transcript.{output_format}"
+    state_file = f"{output_file}.progress.json"
+    source = os.stat(video_path)
+    fingerprint = {"source": os.path.abspath(video_path), "size": source.st_size,
+                   "mtime": source.st_mtime, "model": model_size, "language": language,
+                   "format": output_format, "chunk_minutes": chunk_minutes}
+
+    state = None
+    if os.path.exists(state_file) and os.path.exists(output_file):
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("fingerprint") != fingerprint:
+            state = None
+
+    print(f"--- Memulai Transkripsi Chunked ---")
+    print(f"File: {video_path}")
+    print(f"Model: {model_size}, worker: {jobs}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pcm_path = os.path.join(temp_dir, "audio.pcm")
+        print("Mengekstrak audio...")
+        started = time.perf_counter()
+        try:
+            extract_audio(video_path, pcm_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"\nTerjadi kesalahan saat mengekstrak audio (pastikan ffmpeg terinstall): {e}")
+            return
+        print(f"Audio diekstrak dalam {time.perf_counter() - started:.2f} detik.")
+
+        cache_key = None
+        if cache is not None:
+            # PCM yang sama dengan decode_audio(), jadi kuncinya sama dengan mode biasa
+            cache_key = cache.key(_file_digest(pcm_path), model_size, language)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                _write_segments(output_file, output_format, entry["segments"])
+                if os.path.exists(state_file):
+                    os.remove(state_file)
+                print("\n--- Transkripsi Selesai (diambil dari cache) ---")
+                print(f"Hasil disimpan di: {output_file}")
+                return
+
+        if state is None:
+            samples = np.memmap(pcm_path, dtype=np.int16, mode="r")
+            bounds = split_at_silence(samples, chunk_minutes * 60)
+            del samples
+            with open(output_file, "wb") as out:
+                if output_format == "vtt":
+                    out.write(b"WEBVTT\n\n")
+                offset = out.tell()
+            state = {"fingerprint": fingerprint, "bounds": bounds, "done": 0,
+                     "offset": offset, "next_index": 1, "segments": []}
+            _save_state(state_file, state)
+        else:
+            print(f"Melanjutkan dari potongan {state['done'] + 1}/{len(state['bounds']) - 1}...")
+            # Buang tulisan parsial setelah titik simpan terakhir
+            with open(output_file, "r+b") as out:
+                out.truncate(state["offset"])
+
+        bounds = state["bounds"]
+        total_chunks = len(bounds) - 1
+        pending = [(i, pcm_path, bounds[i], bounds[i + 1], language)
+                   for i in range(state["done"], total_chunks)]
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+
+        started = time.perf_counter()
+        finished = {}
+        pool = multiprocessing.Pool(min(jobs, max(1, len(pending))),
+                                    initializer=_init_chunk_worker, initargs=(model_size, threads))
+        try:
+            with open(output_file, "ab") as out:
+                for index, segments in pool.imap_unordered(_transcribe_chunk, pending):
+                    finished[index] = segments
+                    # Potongan ditulis sesuai urutan, meskipun selesai tidak berurutan
+                    while state["done"] in finished:
+                        offset = bounds[state["done"]] / SAMPLE_RATE
+                        for start, end, text in finished.pop(state["done"]):
+                            out.write(_format_segment(output_format, state["next_index"],
+                                                      offset + start, offset + end, text).encode("utf-8"))
+                            state["segments"].append({"start": offset + start, "end": offset + end,
+                                                      "text": text})
+                            state["next_index"] += 1
+                        out.flush()
+                        os.fsync(out.fileno())
+                        state["done"] += 1
+                        state["offset"] = out.tell()
+                        _save_state(state_file, state)
+                        print(f"Potongan {state['done']}/{total_chunks} selesai "
+                              f"({time.perf_counter() - started:.1f} detik)")
+            pool.close()
+        except KeyboardInterrupt:
+            pool.terminate()
+            print(f"\nDihentikan. Hasil parsial ({state['done']}/{total_chunks} potongan) ada di: {output_file}")
+            print("Jalankan ulang perintah yang sama untuk melanjutkan.")
+            return
+        except Exception as e:
+            pool.terminate()
+            print(f"\nTerjadi kesalahan: {e}")
+            print("Jalankan ulang perintah yang sama untuk melanjutkan.")
+            return
+        finally:
+            pool.join()
+
+    os.remove(state_file)
+    if cache is not None:
+        cache.put(cache_key, " ".join(seg["text"] for seg in state["segments"]), state["segments"])
+    print("\n--- Transkripsi Selesai ---")
+    print(f"Waktu transkripsi: {time.perf_counter() - started:.2f} detik")
+    print(f"Hasil disimpan di: {output_file}")
+
+
+# --- Mode worker: model tetap di memori, dipanggil lewat socket UNIX ---
+
+class _TranscribeHandler(socketserver.StreamRequestHandler):
+    """Menerima satu permintaan JSON per baris dan membalas dengan satu baris JSON."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = transcribe_cached(lambda: self.server.model, request["video_path"],
+                                           self.server.model_size, request.get("language"),
+                                           self.server.cache)
+                response = {"ok": True, "output_file": result["output_file"],
+                            "text": result["text"], "seconds": result["seconds"],
+                            "cached": result["cached"]}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def serve(model_size, socket_path, cache=None):
+    """
+    Menjalankan worker yang menyimpan model di memori sampai dihentikan.
+
+    Mengembalikan False tanpa memuat model bila worker lain sudah mendengarkan
+    di socket_path; hanya socket basi (tanpa worker) yang dihapus.
+    """
+    sock = connect_worker(socket_path)
+    if sock is not None:
+        sock.close()
+        print(f"Error: worker lain sudah berjalan di {socket_path}.")
+        return False
+    model, _ = load_model(model_size)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    # Permintaan dilayani satu per satu karena model tidak thread-safe
+    with socketserver.UnixStreamServer(socket_path, _TranscribeHandler) as server:
+        server.model = model
+        server.model_size = model_size
+        server.cache = cache
+        inode = os.stat(socket_path).st_ino
+        print(f"Worker siap di {socket_path} (Ctrl+C untuk berhenti)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nWorker dihentikan.")
+        finally:
+            # Hapus hanya socket milik worker ini
+            with contextlib.suppress(OSError):
+                if os.stat(socket_path).st_ino == inode:
+                    os.remove(socket_path)
+    return True
+
+
+def connect_worker(socket_path):
+    """Mengembalikan koneksi ke worker yang sedang berjalan, atau None."""
+    if not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
     try:
-        # Load model
-        model = whisper.load_model(model_size)
-        
-        print("Sedang memproses transkripsi...")
-        
-        # Opsi transkripsi
-        # fp16=False digunakan agar kompatibel dengan CPU jika tidak ada GPU
-        options = {"fp16": False} 
-        if language:
-            options["language"] = language
-
-        result = model.transcribe(video_path, **options)
-        
-        transcribed_text = result["text"]
-        
-        # Simpan hasil ke file .txt
-        base_name = os.path.splitext(video_path)[0]
-        output_file = f"{base_name}_transcript.txt"
-        
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(transcribed_text)
-            
-        print("\n--- Transkripsi Selesai ---")
-        print(f"Hasil disimpan di: {output_file}")
-        
-        # Tampilkan sedikit preview
-        print("\nPreview (100 karakter pertama):")
-        print(transcribed_text[:100] + "...")
-
-    except Exception as e:
-        print(f"\nTerjadi kesalahan: {e}")
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def transcribe_via_worker(sock, video_paths, language=None):
+    """
+    Mengirim file ke worker yang sudah memuat model.
+
+    Returns:
+        list: File yang belum ditranskrip karena worker terputus (kosong bila semua selesai).
+    """
+    print(f"--- Memulai Transkripsi (via worker, model sudah dimuat) ---")
+    total_seconds = 0.0
+    with sock, sock.makefile("rwb") as stream:
+        for index, video_path in enumerate(video_paths):
+            if not os.path.exists(video_path):
+                print(f"Error: File '{video_path}' tidak ditemukan.")
+                continue
+            print(f"\nSedang memproses transkripsi: {video_path}")
+            request = {"video_path": os.path.abspath(video_path), "language": language}
+            try:
+                stream.write((json.dumps(request) + "\n").encode("utf-8"))
+                stream.flush()
+                response = json.loads(stream.readline())
+            except (OSError, ValueError):
+                # Baris kosong (worker mati/menutup koneksi) atau balasan terpotong
+                print("\nWorker terputus; sisa file ditranskrip dengan memuat model sendiri.")
+                return video_paths[index:]
+            if not response["ok"]:
+                print(f"\nTerjadi kesalahan: {response['error']}")
+                continue
+            total_seconds += response["seconds"]
+            _print_result(video_path, response)
+
+    print("\n--- Ringkasan Waktu ---")
+    print("Memuat model  : 0.00 detik (model sudah ada di worker)")
+    print(f"Transkripsi   : {total_seconds:.2f} detik")
+    return []
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Script Transkripsi Video (MP4) ke Teks")
-    parser.add_argument("video_path", help="Path ke file video mp4")
+    parser.add_argument("video_paths", nargs="*", help="Path ke file video mp4 atau direktori berisi video")
     parser.add_argument("--model", default="small", choices=["tiny", "base", "small", "medium", "large"], 
                         help="Ukuran model. 'small' cepat, 'large' paling akurat (bagus untuk logat daerah).")
     parser.add_argument("--lang", help="Kode bahasa (contoh: 'id' untuk Indonesia). Kosongkan untuk auto-detect.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Jalankan worker yang menyimpan model di memori, dipanggil lewat socket UNIX.")
+    parser.add_argument("--socket", help="Path socket UNIX worker (default: per ukuran model).")
+    parser.add_argument("--no-worker", action="store_true",
+                        help="Jangan gunakan worker yang sedang berjalan; muat model sendiri.")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Potong audio di bagian hening dan transkrip potongan secara paralel; "
+                             "hasil ditulis bertahap dan dapat dilanjutkan setelah terhenti.")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Jumlah proses worker untuk --chunked (default: setengah jumlah CPU).")
+    parser.add_argument("--chunk-minutes", type=chunk_minutes, default=10,
+                        help="Target durasi tiap potongan dalam menit untuk --chunked (default: 10).")
+    parser.add_argument("--format", default="txt", choices=["txt", "srt", "vtt"],
+                        help="Format hasil untuk --chunked (default: txt dengan timestamp).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Jangan gunakan cache transkrip.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Direktori cache transkrip (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f"Ukuran maksimal cache dalam MB (default: {DEFAULT_CACHE_SIZE_MB}).")
 
     args = parser.parse_args()
-    
-    transcribe_video(args.video_path, args.model, args.lang)
+    socket_path = args.socket or default_socket_path(args.model)
+    cache = None if args.no_cache else TranscriptCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    if args.serve:
+        sys.exit(0 if serve(args.model, socket_path, cache) else 1)
+
+    if not args.video_paths:
+        parser.error("minimal satu video_path diperlukan")
+
+    video_paths = collect_media(args.video_paths)
+    if args.chunked:
+        for video_path in video_paths:
+            transcribe_chunked(video_path, args.model, args.lang, args.jobs,
+                               args.chunk_minutes, args.format, cache)
+        sys.exit(0)
+
+    sock = None if args.no_worker else connect_worker(socket_path)
+    if sock is not None:
+        video_paths = transcribe_via_worker(sock, video_paths, args.lang)
+    if video_paths:
+        transcribe_batch(video_paths, args.model, args.lang, cache)